@@ -16,6 +16,7 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+from multiprocessing import freeze_support
 from sys import exit
 from src.controllers import ChessClaimController
 from PyQt6.QtWidgets import QApplication
@@ -24,6 +25,7 @@ from PyQt6.QtGui import QIcon
 from src.helpers import resource_path
 
 if __name__ == '__main__':
+    freeze_support()  # The scan worker processes of the frozen app start from this executable
     app = ChessClaimController()
     app.setStyle('fusion')
     app.setWindowIcon(QIcon(resource_path("logo.png")))
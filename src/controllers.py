@@ -28,7 +28,7 @@ from PyQt6.QtWidgets import QApplication
 from src.helpers import get_appdata_path, Status
 from src.models.claims import Claims
 from src.models.game_tracker import GameTracker
-from src.models.workers import CheckDownload, DownloadGames, ScanFile, Stop
+from src.models.workers import CheckDownload, DownloadGames, ScanFiles, Stop
 from src.views.dialog_view import AddSourceDialog
 from src.views.dialog_view import SourceHBox
 from src.views.main_view import ChessClaimView, sources_warning
@@ -42,7 +42,7 @@ class ChessClaimController(QApplication):
         view: The main views(GUI) of the application.
         game_tracker: Tracks all games and their state.
     """
-    __slots__ = ['view', 'model', 'sources_dialog', 'stop_worker', 'download_worker', 'scan_workers',
+    __slots__ = ['view', 'model', 'sources_dialog', 'stop_worker', 'download_worker', 'scan_worker',
                  'stop_event', 'game_tracker', 'file_game_counts']
 
     def __init__(self) -> None:
@@ -53,7 +53,7 @@ class ChessClaimController(QApplication):
         self.sources_dialog = None
 
         self.download_worker = None
-        self.scan_workers = []  # List of per-file scan workers
+        self.scan_worker = None
         self.stop_worker = None
         self.file_game_counts = {}  # Track game count per file
 
@@ -100,9 +100,9 @@ class ChessClaimController(QApplication):
             sources_warning()
             return
 
-        """ If any scan thread is alive it means the scan button is already
+        """ If the scan thread is alive it means the scan button is already
         clicked before. So if the user click it again nothing should happen."""
-        if self.scan_workers and any(w.isRunning() for w in self.scan_workers):
+        if self.scan_worker and self.scan_worker.isRunning():
             return
 
         self.view.clear_table()
@@ -113,19 +113,19 @@ class ChessClaimController(QApplication):
         if download_list:
             self.start_download_worker(download_list)
 
-        # Start per-file scan workers (no MakePgn needed)
-        self.start_scan_workers()
+        # Start the scan worker (no MakePgn needed)
+        self.start_scan_worker()
 
     def on_stop_button_clicked(self) -> None:
         """ Creates a thread in order to stop all the other running Threads(
-        downloadWorker, scanWorkers)
+        downloadWorker, scanWorker)
 
         trigger: User clicks the "Stop" Button on the Main Window.
         """
-        if not self.scan_workers or not any(w.isRunning() for w in self.scan_workers):
+        if not self.scan_worker or not self.scan_worker.isRunning():
             return
 
-        self.stop_worker = Stop(self.stop_event, self.scan_workers, self.download_worker)
+        self.stop_worker = Stop(self.stop_event, self.scan_worker, self.download_worker)
 
         self.stop_worker.enable_signal.connect(self.on_stop_enable_status)
         self.stop_worker.disable_signal.connect(self.on_stop_disable_status)
@@ -179,8 +179,9 @@ class ChessClaimController(QApplication):
         else:
             self.view.set_sources_status(Status.ERROR)
 
-    def update_claims_table(self, entry: list) -> None:
-        self.view.add_item_to_table(entry)
+    def update_claims_table(self, entries: list) -> None:
+        for entry in entries:
+            self.view.add_item_to_table(entry)
 
     def update_download_status(self, status: Status) -> None:
         self.view.set_download_status(status)
@@ -196,35 +197,32 @@ class ChessClaimController(QApplication):
         self.download_worker.status_signal.connect(self.update_download_status)
         self.download_worker.start()
 
-    def start_scan_workers(self) -> None:
-        """Start a ScanFile worker for each source file."""
-        filepaths = self.sources_dialog.get_filepath_list()
-        self.scan_workers = []
-        
-        for filepath in filepaths:
-            worker = ScanFile(
-                self.model,
-                self.game_tracker,
-                filepath,
-                self.view.live_pgn_option,
-                self.stop_event
-            )
-            worker.add_entry_signal.connect(self.update_claims_table)
-            worker.status_signal.connect(self.update_bar_scan_status)
-            worker.games_count_signal.connect(self.update_games_count)
-            worker.game_update_signal.connect(self.update_game_display)
-            worker.start()
-            self.scan_workers.append(worker)
+    def start_scan_worker(self) -> None:
+        """Start a ScanFiles worker for all the source files."""
+        self.scan_worker = ScanFiles(
+            self.model,
+            self.game_tracker,
+            list(self.sources_dialog.get_filepath_list()),
+            self.view.live_pgn_option,
+            self.stop_event
+        )
+        self.scan_worker.add_entry_signal.connect(self.update_claims_table)
+        self.scan_worker.status_signal.connect(self.update_bar_scan_status)
+        self.scan_worker.games_count_signal.connect(self.update_games_count)
+        self.scan_worker.game_update_signal.connect(self.update_game_display)
+        self.scan_worker.start()
 
     def update_games_count(self, filepath: str, count: int) -> None:
-        """Aggregate game counts from all scan workers."""
+        """Aggregate game counts from all the scanned files."""
         self.file_game_counts[filepath] = count
         total = sum(self.file_game_counts.values())
         self.view.set_games_count(total)
 
-    def update_game_display(self, players: str) -> None:
-        if players in self.game_tracker.games:
-            self.view.update_game_in_table(self.game_tracker.games[players])
+    def update_game_display(self, players_list: list) -> None:
+        for players in players_list:
+            game = self.game_tracker.get_game(players)
+            if game:
+                self.view.update_game_in_table(game)
 
 
 class SourceDialogController:
@@ -16,22 +16,46 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
+import sys
 from enum import Enum
 from math import ceil
 from threading import Lock
 
+from chess import Board
 from chess.pgn import Game
 
 
 def get_players(game: Game) -> str:
     white = game.headers["White"][:22]
     black = game.headers["Black"][:22]
-    return f"{white} - {black}"
+    # Interned, so the dictionary lookups keyed by players short-circuit on identity.
+    return sys.intern(f"{white} - {black}")
+
+
+def get_claims(board: Board) -> list:
+    """ Checks the position after the last move of the board for 3 Fold Repetitions,
+    5 Fold Repetitions, 50 Move Draw Rule and for the 75 Move Draw Rule.
+
+    Returns:
+        The claim types that are valid. A 5 Fold Repetition or the 75 Move Draw Rule
+        end the game, so they are returned alone.
+    """
+    if board.is_fivefold_repetition():
+        return [ClaimType.FIVEFOLD]
+    if board.is_seventyfive_moves():
+        return [ClaimType.SEVENTYFIVE_MOVES]
+
+    claim_types = []
+    if board.is_fifty_moves():
+        claim_types.append(ClaimType.FIFTY_MOVES)
+    if board.is_repetition(count=3):
+        claim_types.append(ClaimType.THREEFOLD)
+    return claim_types
 
 
 class Claims:
     """
-    Thread-safe claims checker.
+    Thread-safe record of the claims found in the scanned games.
     
     Attributes:
         dont_check(set): Is a set of player's names who's their game shall not
@@ -51,43 +75,20 @@ class Claims:
         with self._lock:
             return players in self.dont_check
 
-    def check_game(self, game: Game) -> set:
-        """ Checks the game for 3 Fold Repetitions, 5 Fold Repetitions, 50 Move Draw Rule and for the 75 Move Draw Rule.
+    def add_entries(self, game_entries: set) -> set:
+        """ Records the entries found in a game (see get_claims). The players of a
+        5 Fold Repetition or 75 Moves Rule entry are not checked again.
         Thread-safe.
-        
+
         Args:
-            game: The game to be checked.
+            game_entries: The entries of the game. Each element is a tuple.
+        Returns:
+            The entries that weren't recorded before.
         """
-        move_counter = 0
-        board = game.board()
-        players = get_players(game)
-        board_number = self.get_board_number(game)
-        game_entries = set()
-
-        # Loop to go through of all the moves of the game.
-        for move in game.mainline_moves():
-            san_move = str(board.san(move))
-            board.push(move)
-
-            move_counter += 1
-            printable_move = self.get_printable_move(move_counter, san_move)
-
-            if board.is_fivefold_repetition():
-                game_entries.add((ClaimType.FIVEFOLD, board_number, players, printable_move))
-                with self._lock:
-                    self.dont_check.add(players)
-                break
-            if board.is_seventyfive_moves():
-                game_entries.add((ClaimType.SEVENTYFIVE_MOVES, board_number, players, printable_move))
-                with self._lock:
-                    self.dont_check.add(players)
-                break
-            if board.is_fifty_moves():
-                game_entries.add((ClaimType.FIFTY_MOVES, board_number, players, printable_move))
-            if board.is_repetition(count=3):
-                game_entries.add((ClaimType.THREEFOLD, board_number, players, printable_move))
-
         with self._lock:
+            for claim_type, _, players, _ in game_entries:
+                if claim_type in FINAL_CLAIMS:
+                    self.dont_check.add(players)
             game_entries = game_entries - self.entries
             self.entries.update(game_entries)
         return game_entries
@@ -129,3 +130,10 @@ class ClaimType(Enum):
     FIVEFOLD = "5 Fold Repetition"
     FIFTY_MOVES = "50 Moves Rule"
     SEVENTYFIVE_MOVES = "75 Moves Rule"
+
+
+# The (interned) value of each claim type, to avoid the Enum attribute lookup on hot paths
+CLAIM_VALUE = {claim_type: sys.intern(claim_type.value) for claim_type in ClaimType}
+
+# The claims after which the game is over
+FINAL_CLAIMS = frozenset((ClaimType.FIVEFOLD, ClaimType.SEVENTYFIVE_MOVES))
@@ -17,10 +17,18 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import ssl
+import sys
 import urllib.request
+from http.client import HTTPConnection, HTTPException, HTTPSConnection, RemoteDisconnected
+from typing import Dict, Set
 from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
 import certifi
 
+# The User-Agent urllib sends, so the servers treat both download paths the same
+USER_AGENT = f"Python-urllib/{sys.version_info.major}.{sys.version_info.minor}"
+
 
 def check_download(url: str, timeout=4) -> bool:
     """ Checks if the url points to an existing pgn file.
@@ -46,3 +54,85 @@ def download_pgn(url: str, timeout=10) -> bytes:
         return response.read()
     except (HTTPError, URLError):
         return bytes()
+
+
+class PgnDownloader:
+    """ Downloads pgn files over a kept-alive connection per url, so polling a
+    source doesn't repeat the DNS lookup and the TLS handshake every time.
+    Different urls can be downloaded from different threads, but not the same url.
+
+    Attributes:
+        timeout: The timeout of the connections in seconds.
+        connections: The open connection of each url.
+        ssl_context: The SSL context of the https connections.
+        urllib_urls: The urls that responded with a redirect, which are downloaded
+            with download_pgn from then on.
+    """
+    __slots__ = ["timeout", "connections", "ssl_context", "urllib_urls"]
+
+    def __init__(self, timeout=10):
+        self.timeout = timeout
+        self.connections: Dict[str, HTTPConnection] = {}
+        self.ssl_context = ssl.create_default_context(cafile=certifi.where())
+        self.urllib_urls: Set[str] = set()
+
+    def download(self, url: str) -> bytes:
+        """ Same as download_pgn, over the kept-alive connection of the url.
+        Urls that respond with a redirect and urls that go through a proxy are
+        left to download_pgn.
+        """
+        parts = urlsplit(url)
+        if (url in self.urllib_urls or parts.scheme not in ("http", "https")
+                or parts.scheme in urllib.request.getproxies()):
+            return download_pgn(url, self.timeout)
+
+        path = parts.path or "/"
+        if parts.query:
+            path += f"?{parts.query}"
+
+        while True:
+            is_reused = url in self.connections
+            connection = self.get_connection(url)
+            try:
+                connection.request("GET", path, headers={"User-Agent": USER_AGENT})
+                response = connection.getresponse()
+                data = response.read()
+            except (RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self.close_connection(url)
+                # The server closed the kept-alive connection, retry once on a new one
+                if is_reused:
+                    continue
+                return bytes()
+            except (HTTPException, OSError):
+                self.close_connection(url)
+                return bytes()
+
+            if 300 <= response.status < 400:
+                self.close_connection(url)
+                self.urllib_urls.add(url)
+                return download_pgn(url, self.timeout)
+            if response.status != 200:
+                # Same as download_pgn on an HTTPError, the url is retried on the next poll
+                self.close_connection(url)
+                return bytes()
+            return data
+
+    def get_connection(self, url: str) -> HTTPConnection:
+        connection = self.connections.get(url)
+        if connection is None:
+            parts = urlsplit(url)
+            if parts.scheme == "https":
+                connection = HTTPSConnection(parts.netloc, timeout=self.timeout, context=self.ssl_context)
+            else:
+                connection = HTTPConnection(parts.netloc, timeout=self.timeout)
+            self.connections[url] = connection
+        return connection
+
+    def close_connection(self, url: str) -> None:
+        connection = self.connections.pop(url, None)
+        if connection:
+            connection.close()
+
+    def close(self) -> None:
+        for url in list(self.connections):
+            self.close_connection(url)
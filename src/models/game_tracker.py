@@ -4,12 +4,12 @@ Chess Claim Tool: Game Tracker
 Tracks the state of all games being scanned, including move count,
 last update time, and game status.
 """
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
 from enum import Enum
 from threading import Lock
-from typing import Dict, Optional, List
-from chess.pgn import Game
+from typing import Dict, Optional, List, Tuple
+from src.models.claims import ClaimType
 
 
 class GameStatus(Enum):
@@ -18,73 +18,138 @@ class GameStatus(Enum):
     INVALID = "Invalid"
 
 
-@dataclass
+# Maps (has_error, is the game being played) to the status of the game
+_STATUS_TABLE: Dict[Tuple[bool, bool], GameStatus] = {
+    (False, True): GameStatus.ACTIVE,
+    (False, False): GameStatus.FINISHED,
+    (True, True): GameStatus.INVALID,
+    (True, False): GameStatus.INVALID,
+}
+
+# Maps each claim type value to its bit in TrackedGame.claims_mask
+CLAIM_BITS: Dict[str, int] = {claim_type.value: 1 << index for index, claim_type in enumerate(ClaimType)}
+
+
+@dataclass(slots=True)
 class TrackedGame:
     """Represents a tracked game's state."""
     players: str
     board: str
     move_count: int
-    last_update: datetime
     status: GameStatus
+    last_update: float = field(default_factory=time.monotonic)  # time.monotonic() of the last move
     result: str = "*"
     last_move: str = ""
-    claims: List[str] = field(default_factory=list)
+    claims_mask: int = 0
     has_error: bool = False
     error_at_move: Optional[int] = None
+    # The last formatted time_since_update, the time.monotonic() until which it's still valid
+    # and the last_update it was formatted for
+    _last_fmt: str = field(default="", init=False, repr=False, compare=False)
+    _last_fmt_until: float = field(default=0.0, init=False, repr=False, compare=False)
+    _last_fmt_for: float = field(default=-1.0, init=False, repr=False, compare=False)
+
+    @property
+    def claims(self) -> List[str]:
+        """Returns the claim type values that are set in claims_mask."""
+        return [value for value, bit in CLAIM_BITS.items() if self.claims_mask & bit]
 
     def time_since_update(self) -> str:
-        """Returns formatted string of time since last update."""
-        delta = datetime.now() - self.last_update
-        total_seconds = int(delta.total_seconds())
+        """Returns formatted string of time since last update.
+
+        The string is cached until the displayed value changes, i.e. for the rest
+        of the current second under a minute and of the current minute after that,
+        or until last_update changes.
+        """
+        now = time.monotonic()
+        # Read once, as the scan thread may update it meanwhile
+        last_update = self.last_update
+        if now < self._last_fmt_until and self._last_fmt_for == last_update:
+            return self._last_fmt
+
+        elapsed = now - last_update
+        total_seconds = int(elapsed)
         
         if total_seconds < 60:
-            return f"{total_seconds}s"
+            bucket = 1
+            self._last_fmt = f"{total_seconds}s"
         elif total_seconds < 3600:
+            bucket = 60
             minutes = total_seconds // 60
-            return f"{minutes}m"
+            self._last_fmt = f"{minutes}m"
         else:
+            bucket = 60
             hours = total_seconds // 3600
             minutes = (total_seconds % 3600) // 60
-            return f"{hours}h {minutes}m"
+            self._last_fmt = f"{hours}h {minutes}m"
+
+        self._last_fmt_until = now + bucket - elapsed % bucket
+        self._last_fmt_for = last_update
+        return self._last_fmt
 
 
 class GameTracker:
     """
     Thread-safe tracker for all games being scanned across scan cycles.
+
+    Games are written by the single ScanFiles thread and read by the GUI. They
+    are sharded into BINS bins by the hash of the players string, each bin with
+    its own lock. The GUI looks games up with get_game without taking the locks,
+    so the bins only keep its lookups apart from the scan writer.
+
+    Readers get an immutable snapshot of all the games that is republished
+    whenever a game is added or the tracker is cleared, so they never block
+    the scan thread (and vice versa).
     
     Attributes:
-        games: Dictionary mapping player string to TrackedGame
-        _lock: Threading lock for thread-safe access.
+        _bins: List of (lock, games) pairs. Each games dictionary maps a player
+            string to its TrackedGame.
+        _snapshot: Tuple of all tracked games, replaced (never mutated) by writers.
+        _snapshot_lock: Serializes the writers of the snapshot. Always acquired
+            after a bin lock.
     """
-    
+    BINS = 16  # Must be a power of two
+
     def __init__(self):
-        self.games: Dict[str, TrackedGame] = {}
-        self._lock = Lock()
+        self._bins: List[Tuple[Lock, Dict[str, TrackedGame]]] = [(Lock(), {}) for _ in range(self.BINS)]
+        self._snapshot: Tuple[TrackedGame, ...] = ()
+        self._snapshot_lock = Lock()
+
+    def _get_bin(self, players: str) -> Tuple[Lock, Dict[str, TrackedGame]]:
+        return self._bins[hash(players) & (self.BINS - 1)]
     
-    def update_game(self, game: Game, players: str, board: str, 
+    def update_game(self, result: str, players: str, board: str, 
                     move_count: int, last_move: str, 
-                    has_error: bool = False, error_at_move: Optional[int] = None) -> TrackedGame:
+                    has_error: bool = False, error_at_move: Optional[int] = None,
+                    now: Optional[float] = None) -> TrackedGame:
         """
         Update or create a tracked game entry. Thread-safe.
+
+        Args:
+            result: The result of the game, "*" while it's being played.
+            now: The time.monotonic() of the current scan pass. Scanners pass one value
+                for the whole file so the clock is read once per pass, not per game.
         
         Returns the TrackedGame (new or updated).
         """
-        result = game.headers.get("Result", "*")
-        
-        if result == "*":
-            status = GameStatus.ACTIVE
-        else:
-            status = GameStatus.FINISHED
-        
-        if has_error:
-            status = GameStatus.INVALID
+        if now is None:
+            now = time.monotonic()
+
+        status = _STATUS_TABLE[(has_error, result == "*")]
         
-        with self._lock:
-            if players in self.games:
-                existing = self.games[players]
+        lock, games = self._get_bin(players)
+        with lock:
+            existing = games.get(players)
+            if existing is not None:
+                # Most polls find the game unchanged, skip the writes then
+                if (move_count, status, result, last_move, has_error, error_at_move) == (
+                        existing.move_count, existing.status, existing.result, existing.last_move,
+                        existing.has_error, existing.error_at_move):
+                    return existing
+
                 # Only update timestamp if move count changed
                 if move_count != existing.move_count:
-                    existing.last_update = datetime.now()
+                    existing.last_update = now
                 existing.move_count = move_count
                 existing.status = status
                 existing.result = result
@@ -97,27 +162,43 @@ class GameTracker:
                     players=players,
                     board=board,
                     move_count=move_count,
-                    last_update=datetime.now(),
+                    last_update=now,
                     status=status,
                     result=result,
                     last_move=last_move,
                     has_error=has_error,
                     error_at_move=error_at_move
                 )
-                self.games[players] = tracked
+                games[players] = tracked
+                with self._snapshot_lock:
+                    self._snapshot = self._snapshot + (tracked,)
                 return tracked
     
     def add_claim_to_game(self, players: str, claim_type: str) -> None:
         """Add a claim to a tracked game. Thread-safe."""
-        with self._lock:
-            if players in self.games:
-                if claim_type not in self.games[players].claims:
-                    self.games[players].claims.append(claim_type)
+        lock, games = self._get_bin(players)
+        with lock:
+            tracked = games.get(players)
+            if tracked is not None:
+                tracked.claims_mask |= CLAIM_BITS[claim_type]
+
+    def get_game(self, players: str) -> Optional[TrackedGame]:
+        """Returns the tracked game of the players, or None if it's not tracked."""
+        return self._get_bin(players)[1].get(players)
     
-    def get_all_games(self) -> List[TrackedGame]:
-        """Returns list of all tracked games."""
-        return list(self.games.values())
+    def get_all_games(self) -> Tuple[TrackedGame, ...]:
+        """Returns a snapshot of all tracked games. Doesn't block the writers."""
+        return self._snapshot
     
     def clear(self) -> None:
         """Clear all tracked games."""
-        self.games.clear()
+        for lock, _ in self._bins:
+            lock.acquire()
+        try:
+            for _, games in self._bins:
+                games.clear()
+            with self._snapshot_lock:
+                self._snapshot = ()
+        finally:
+            for lock, _ in self._bins:
+                lock.release()
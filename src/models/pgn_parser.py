@@ -0,0 +1,101 @@
+"""
+Chess Claim Tool: PGN Parser
+
+Parses the games of a PGN chunk into plain, picklable records, so the
+parsing can run in worker processes (see ScanFiles).
+"""
+import io
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from chess.pgn import Game, read_game
+from src.models.claims import Claims, FINAL_CLAIMS, get_claims, get_players
+
+
+@dataclass(slots=True)
+class ParsedGame:
+    """Represents the state of a parsed game and the claims found in it."""
+    players: str
+    board: str
+    result: str
+    move_count: int
+    last_move: str
+    has_error: bool = False
+    error_at_move: Optional[int] = None
+    entries: set = field(default_factory=set)
+
+
+def parse_games(chunk: bytes) -> List[ParsedGame]:
+    """ Parses all the games of a PGN chunk.
+    Args:
+        chunk: The bytes of one or more games of a PGN file.
+    """
+    parsed_games = []
+    # A byte that isn't valid in the encoding shouldn't cost the whole game
+    pgn = io.TextIOWrapper(io.BytesIO(chunk), errors="replace")
+
+    while True:
+        game = read_game(pgn)
+
+        if not game:
+            break
+
+        parsed_games.append(parse_game(game))
+    return parsed_games
+
+
+def parse_game(game: Game) -> ParsedGame:
+    """ Replays the game once, counting its moves and checking every position for claims. """
+    players = get_players(game)
+    board_number = Claims.get_board_number(game)
+
+    # Count moves and get last move, handling potential errors
+    move_count = 0
+    last_move = ""
+    has_error = False
+    error_at_move = None
+    entries = set()
+    check_claims = True
+    san = None
+
+    try:
+        board = game.board()
+        for move in game.mainline_moves():
+            move_count += 1
+            try:
+                san = board.san(move)
+                board.push(move)
+            except Exception:
+                has_error = True
+                error_at_move = move_count
+                last_move = f"Error at move {move_count}"
+                break
+
+            if not check_claims:
+                continue
+
+            for claim_type in get_claims(board):
+                entries.add((claim_type, board_number, players, Claims.get_printable_move(move_count, san)))
+                # No more claims after the game is over
+                if claim_type in FINAL_CLAIMS:
+                    check_claims = False
+    except Exception:
+        has_error = True
+        last_move = "Parse error"
+
+    if has_error:
+        entries.clear()  # No claims for games with errors
+    elif san is not None:
+        # Only the last move is displayed, so only that one is formatted
+        last_move = Claims.get_printable_move(move_count, san)
+
+    return ParsedGame(
+        players=players,
+        board=board_number,
+        result=game.headers.get("Result", "*"),
+        move_count=move_count,
+        last_move=last_move,
+        has_error=has_error,
+        error_at_move=error_at_move,
+        entries=entries
+    )
@@ -19,20 +19,26 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 from __future__ import annotations
 
 import os.path
-from threading import Thread
-from typing import List, TYPE_CHECKING, Dict
+import re
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from time import monotonic
+from typing import List, TYPE_CHECKING, Dict, Tuple
+from zlib import crc32
 
 from PyQt6.QtCore import QRunnable, QThread, pyqtSignal
-from chess.pgn import read_game
 from src.helpers import get_appdata_path, Status
-from src.models.claims import get_players, Claims
-from src.models.download import check_download, download_pgn
+from src.models.claims import Claims, CLAIM_VALUE
+from src.models.download import check_download, PgnDownloader
+from src.models.pgn_parser import ParsedGame, parse_games
 
 if TYPE_CHECKING:
     from src.controllers import SourceDialogController
     from src.views.dialog_view import SourceHBox
     from src.models.game_tracker import GameTracker
-    from threading import Event, Lock
+    from threading import Event
     from PyQt6.QtGui import QAction
 
 
@@ -67,302 +73,350 @@ class DownloadGames(QThread):
     Attributes:
         downloads: The list of urls to download.
         stop_event: A stop signal that is emitted to stop this thread execution
+        downloader: Keeps the connection of each url alive between the downloads.
+        executor: The thread pool that downloads the urls in parallel, while the thread runs.
+        last_hashes: The (length, crc32) of the data last written for each url.
     """
     status_signal = pyqtSignal(Status)
     INTERVAL = 4
-    __slots__ = ["downloads", "stop_event", "app_path"]
+    __slots__ = ["downloads", "stop_event", "app_path", "downloader", "executor", "last_hashes"]
 
     def __init__(self, downloads: Dict[str, str], stop_event: Event = None):
         super().__init__()
         self.downloads = downloads
         self.stop_event = stop_event
         self.app_path = get_appdata_path()
+        self.downloader = PgnDownloader()
+        self.executor = None
+        self.last_hashes: Dict[str, Tuple[int, int]] = {}
 
     def run(self) -> None:
-        if not self.stop_event:
-            return self.download_pgns()
+        self.executor = ThreadPoolExecutor(max_workers=max(len(self.downloads), 1))
 
-        while not self.stop_event.is_set():
-            self.download_pgns()
-            self.stop_event.wait(self.INTERVAL)
+        try:
+            if not self.stop_event:
+                return self.download_pgns()
+
+            while not self.stop_event.is_set():
+                self.download_pgns()
+                self.stop_event.wait(self.INTERVAL)
+        finally:
+            self.executor.shutdown()
+            self.executor = None
+            self.downloader.close()
 
     def download_pgns(self):
-        for url in self.downloads:
+        urls = list(self.downloads)
+
+        for url, data in zip(urls, self.executor.map(self.downloader.download, urls)):
             status = Status.OK
 
-            data = download_pgn(url)
             if not data:
                 status = Status.ERROR
             self.status_signal.emit(status)
 
             filename = self.downloads[url]
+
+            # Unchanged data isn't written, so the scan doesn't see an update
+            data_hash = (len(data), crc32(data))
+            if data_hash == self.last_hashes.get(url) and os.path.exists(filename):
+                continue
+
             try:
-                with open(filename, "wb") as file:
-                    file.write(data)
-            except (FileNotFoundError, TypeError):
+                self.write_file(filename, data)
+            except (OSError, TypeError):
+                # Not recorded in last_hashes, so the write is retried on the next download
                 self.status_signal.emit(Status.ERROR)
                 continue
+            self.last_hashes[url] = data_hash
 
+    @staticmethod
+    def write_file(filename: str, data: bytes) -> None:
+        """ Writes the file atomically, by replacing it with a temporary file, so
+        the scan never reads it half-written. """
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, "wb") as file:
+            file.write(data)
 
-class ScanFile(QThread):
-    """ Scans a single PGN file directly for claims.
-    
-    This replaces the old Scan + MakePgn architecture by reading
-    each source file directly, eliminating the copy step.
+        try:
+            os.replace(tmp_filename, filename)
+        except OSError:
+            os.remove(tmp_filename)
+            raise
+
+
+class PgnFile:
+    """ A PGN file scanned by ScanFiles.
 
     Attributes:
-        filename: The path of the PGN file to scan.
-        claims: An Object of Claims Class (thread-safe).
-        game_tracker: Tracks all games and their state (thread-safe).
-        live_pgn_option: The checkbox object on the menu.
-        stop_event: A stop signal that is emitted to stop this thread execution.
+        filename: The path of the PGN file.
+        last_size: The size of the file at the previous poll.
+        scanned_chunks: Maps the (length, crc32) of each game chunk of the previous
+            scan to the number of games in it.
     """
-    __slots__ = ["filename", "claims", "game_tracker", "live_pgn_option", "stop_event"]
+    __slots__ = ["filename", "last_size", "scanned_chunks"]
 
-    add_entry_signal = pyqtSignal(tuple)
-    status_signal = pyqtSignal(Status)
-    games_count_signal = pyqtSignal(str, int)  # (filepath, count)
-    game_update_signal = pyqtSignal(str)  # Emits players string when a game is updated
-    INTERVAL = 2  # Faster polling since we're not waiting for MakePgn
+    GAME_SEPARATOR = re.compile(rb"(\n\s*\n)(?=\[)")  # An empty line followed by a tag
+    # The tokens that can hide a separator: {} comments, ; comments and tag values
+    COMMENT_TOKEN = re.compile(rb'\{[^}]*\}?|;[^\n]*|"(?:[^"\\\n]|\\.)*"?')
 
-    def __init__(self, claims: Claims, game_tracker: GameTracker, filename: str, live_pgn_option: QAction, stop_event: Event):
-        super().__init__()
+    def __init__(self, filename: str):
         self.filename = filename
-        self.claims = claims
-        self.game_tracker = game_tracker
-        self.live_pgn_option = live_pgn_option
-        self.stop_event = stop_event
-
-    def run(self):
-        last_size = 0
-
-        while not self.stop_event.is_set():
-            try:
-                size_of_pgn = os.path.getsize(self.filename)
-            except FileNotFoundError:
-                size_of_pgn = 0
-
-            if self.is_file_updated(last_size, size_of_pgn):
-                self.status_signal.emit(Status.ACTIVE)
-                self.check_pgn()
+        self.last_size = 0
+        self.scanned_chunks: Dict[Tuple[int, int], int] = {}
 
-            self.status_signal.emit(Status.WAIT)
-            last_size = size_of_pgn
-
-            self.stop_event.wait(self.INTERVAL)
+    def is_updated(self) -> bool:
+        """ Returns True if the size of the file changed since the previous poll. """
+        try:
+            size_of_pgn = os.path.getsize(self.filename)
+        except FileNotFoundError:
+            size_of_pgn = 0
 
-    def check_pgn(self):
-        games_in_scan = 0
+        is_updated = self.is_file_updated(self.last_size, size_of_pgn)
+        self.last_size = size_of_pgn
+        return is_updated
 
+    def read_chunks(self) -> List[bytes]:
+        """ Returns the game chunks of the file. Each chunk holds one game, unless
+        the games aren't separated by an empty line. """
         try:
-            with open(self.filename) as pgn:
-                while not self.stop_event.is_set():
-                    game = read_game(pgn)
-
-                    if not game:
-                        break
-
-                    games_in_scan += 1
-                    players = get_players(game)
-                    board = self.claims.get_board_number(game)
-
-                    # Count moves and get last move, handling potential errors
-                    move_count = 0
-                    last_move = ""
-                    has_error = False
-                    error_at_move = None
-
-                    try:
-                        game_board = game.board()
-                        for move in game.mainline_moves():
-                            move_count += 1
-                            try:
-                                san = game_board.san(move)
-                                game_board.push(move)
-                                last_move = self.claims.get_printable_move(move_count, san)
-                            except Exception:
-                                has_error = True
-                                error_at_move = move_count
-                                last_move = f"Error at move {move_count}"
-                                break
-                    except Exception:
-                        has_error = True
-                        last_move = "Parse error"
-
-                    # Update game tracker for ALL games (thread-safe)
-                    tracked_game = self.game_tracker.update_game(
-                        game, players, board, move_count, last_move, has_error, error_at_move
-                    )
-                    self.game_update_signal.emit(players)
-
-                    # Skip claim checking only if live_pgn is checked AND game is finished
-                    if self.live_pgn_option.isChecked() and game.headers.get("Result", "*") != "*":
-                        continue
-
-                    if self.claims.is_in_dont_check(players):
-                        continue
-
-                    if has_error:
-                        continue  # Skip claim checking for games with errors
-
-                    entries = self.claims.check_game(game)
-                    for entry in entries:
-                        self.add_entry_signal.emit(entry)
-                        # Also track claims in the game tracker
-                        self.game_tracker.add_claim_to_game(players, entry[0].value)
-                        self.game_update_signal.emit(players)
+            with open(self.filename, "rb") as file:
+                data = file.read()
         except FileNotFoundError:
-            pass  # File doesn't exist yet, will retry on next interval
-
-        self.games_count_signal.emit(self.filename, games_in_scan)
+            # File doesn't exist yet, will retry on next interval
+            return []
+
+        """ An empty line followed by a tag can also be inside a {} comment,
+        e.g. before a [%clk] annotation, so the chunks that end in an open
+        comment are joined with the next one."""
+        parts = self.GAME_SEPARATOR.split(data.rstrip())
+        chunks = []
+        chunk = parts[0]
+        for separator, part in zip(parts[1::2], parts[2::2]):
+            if self.is_in_comment(chunk):
+                chunk += separator + part
+            else:
+                chunks.append(chunk)
+                chunk = part
+        chunks.append(chunk)
+        return chunks
+
+    @classmethod
+    def is_in_comment(cls, chunk: bytes) -> bool:
+        """ Returns True if the chunk ends inside an unclosed {} comment. """
+        if b"{" not in chunk:
+            return False
+        token = b""
+        for match in cls.COMMENT_TOKEN.finditer(chunk):
+            token = match.group()
+        return token.startswith(b"{") and not token.endswith(b"}")
 
     @staticmethod
     def is_file_updated(last_size: int, current_size: int):
         return current_size != 0 and last_size != current_size
 
 
-# Keep legacy Scan class for backwards compatibility if needed
-class Scan(QThread):
-    """ [DEPRECATED] Use ScanFile instead.
-    
-    Continuously looks for a new games.pgn to scan. It creates another thread
-    to check the new pgn while it updates the GUI(claimsTable) with new entries.
+class ScanFiles(QThread):
+    """ Scans the PGN files directly for claims.
+
+    The games are parsed in a pool of worker processes, so the scan runs on
+    all the CPU cores instead of a Python thread per file competing for the GIL.
 
     Attributes:
-        filename: The path of the combined pgn file.
-        claims: An Object of Claims Class.
-        game_tracker: Tracks all games and their state.
-        lock: The fileLock for the games.pgn between CheckPgn and MakePgn threads.
+        pgn_files: The PGN files to scan.
+        claims: An Object of Claims Class (thread-safe).
+        game_tracker: Tracks all games and their state (thread-safe).
         live_pgn_option: The checkbox object on the menu.
-        stop_event: A stop signal that is emitted to stop this thread execution
+        stop_event: A stop signal that is emitted to stop this thread execution.
+        executor: The process pool that parses the games, while the thread runs.
+        skip_finished: The live_pgn_option of the previous scan.
     """
-    __slots__ = ["filename", "claims", "game_tracker", "lock", "live_pgn_option", "stop_event"]
+    __slots__ = ["pgn_files", "claims", "game_tracker", "live_pgn_option", "stop_event", "executor",
+                 "skip_finished"]
 
-    add_entry_signal = pyqtSignal(tuple)
+    add_entry_signal = pyqtSignal(list)  # Emits the new entries of a scan
     status_signal = pyqtSignal(Status)
-    games_count_signal = pyqtSignal(int)
-    game_update_signal = pyqtSignal(str)  # Emits players string when a game is updated
-    INTERVAL = 4
+    games_count_signal = pyqtSignal(str, int)  # (filepath, count)
+    game_update_signal = pyqtSignal(list)  # Emits the players strings of the games updated in a scan
+    INTERVAL = 2  # Faster polling since we're not waiting for MakePgn
 
-    def __init__(self, claims: Claims, game_tracker: GameTracker, filename: str, lock: Lock, live_pgn_option: QAction, stop_event: Event):
+    def __init__(self, claims: Claims, game_tracker: GameTracker, filenames: List[str], live_pgn_option: QAction,
+                 stop_event: Event):
         super().__init__()
-        self.filename = filename
+        self.pgn_files = [PgnFile(filename) for filename in filenames]
         self.claims = claims
         self.game_tracker = game_tracker
-        self.lock = lock
         self.live_pgn_option = live_pgn_option
         self.stop_event = stop_event
+        self.executor = None
+        self.skip_finished = None
 
     def run(self):
-        last_size = 0
-
-        while not self.stop_event.is_set():
-            try:
-                size_of_pgn = os.path.getsize(self.filename)
-            except FileNotFoundError:
-                size_of_pgn = 0
-
-            if self.is_file_updated(last_size, size_of_pgn):
-                self.status_signal.emit(Status.ACTIVE)
-                self.check_pgn()
-
-            self.status_signal.emit(Status.WAIT)
-            last_size = size_of_pgn
-
-            self.stop_event.wait(self.INTERVAL)
-
-    def check_pgn(self):
-        self.lock.acquire()
-        games_in_scan = 0
+        self.start_executor()
+        status = Status.WAIT
 
-        with open(self.filename) as pgn:
+        try:
             while not self.stop_event.is_set():
-                game = read_game(pgn)
-
-                if not game:
-                    break
-
-                games_in_scan += 1
-                players = get_players(game)
-                board = self.claims.get_board_number(game)
-
-                # Count moves and get last move, handling potential errors
-                move_count = 0
-                last_move = ""
-                has_error = False
-                error_at_move = None
-
-                try:
-                    game_board = game.board()
-                    for move in game.mainline_moves():
-                        move_count += 1
-                        try:
-                            san = game_board.san(move)
-                            game_board.push(move)
-                            last_move = self.claims.get_printable_move(move_count, san)
-                        except Exception:
-                            has_error = True
-                            error_at_move = move_count
-                            last_move = f"Error at move {move_count}"
-                            break
-                except Exception:
-                    has_error = True
-                    last_move = "Parse error"
-
-                # Update game tracker for ALL games
-                tracked_game = self.game_tracker.update_game(
-                    game, players, board, move_count, last_move, has_error, error_at_move
-                )
-                self.game_update_signal.emit(players)
-
-                # Skip claim checking only if live_pgn is checked AND game is finished
-                # (we now process finished games for claims too)
-                if self.live_pgn_option.isChecked() and game.headers.get("Result", "*") != "*":
-                    continue
-
-                if players in self.claims.dont_check:
-                    continue
-
-                if has_error:
-                    continue  # Skip claim checking for games with errors
-
-                entries = self.claims.check_game(game)
-                for entry in entries:
-                    self.add_entry_signal.emit(entry)
-                    # Also track claims in the game tracker
-                    self.game_tracker.add_claim_to_game(players, entry[0].value)
-                    self.game_update_signal.emit(players)
-
-        self.games_count_signal.emit(games_in_scan)
-        self.lock.release()
+                updated_files = [pgn_file for pgn_file in self.pgn_files if pgn_file.is_updated()]
+
+                if updated_files:
+                    self.status_signal.emit(Status.ACTIVE)
+                    # The error stays on the status bar until a scan succeeds
+                    status = Status.WAIT if self.check_pgns(updated_files) else Status.ERROR
+
+                self.status_signal.emit(status)
+                self.stop_event.wait(self.INTERVAL)
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def start_executor(self) -> None:
+        """ Starts a new process pool, replacing the current one (e.g. when it's broken). """
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        # Spawn, as forking a process with running Qt threads isn't safe
+        self.executor = ProcessPoolExecutor(mp_context=get_context("spawn"))
+
+    def submit(self, chunk: bytes) -> Future:
+        try:
+            return self.executor.submit(parse_games, chunk)
+        except BrokenProcessPool:
+            # A worker process died since the previous scan
+            self.start_executor()
+            return self.executor.submit(parse_games, chunk)
+
+    def check_pgns(self, pgn_files: List[PgnFile]) -> bool:
+        """ Scans the files that were updated.
+        Returns:
+            False if any of the files couldn't be scanned, True otherwise.
+        """
+        scan_now = monotonic()
+        # The option can only change on the GUI thread, read it once per scan
+        skip_finished = self.live_pgn_option.isChecked()
+
+        """ The claims of the games in unchanged chunks were checked with the previous
+        option, so when it changes all the games are parsed and checked again."""
+        if skip_finished != self.skip_finished:
+            for pgn_file in self.pgn_files:
+                pgn_file.scanned_chunks.clear()
+            self.skip_finished = skip_finished
+        updated_players = []
+        new_entries = []
+
+        """ Each file is split into game chunks and only the chunks whose bytes
+        changed since the previous scan are sent to the worker processes. The
+        games of the unchanged chunks are already in the game tracker."""
+        scans = []
+        for pgn_file in pgn_files:
+            chunks = []
+            for chunk in pgn_file.read_chunks():
+                key = (len(chunk), crc32(chunk))
+                games_in_chunk = pgn_file.scanned_chunks.get(key)
+                future = self.submit(chunk) if games_in_chunk is None else None
+                chunks.append((key, games_in_chunk, future))
+            scans.append((pgn_file, chunks))
+
+        is_scanned = True
+        is_pool_broken = False
+
+        for pgn_file, chunks in scans:
+            if self.stop_event.is_set():
+                # The claims of the files merged so far are still sent to the GUI
+                break
 
-    @staticmethod
-    def is_file_updated(last_size: int, current_size: int):
-        return current_size != 0 and last_size != current_size
+            try:
+                results = [(key, games_in_chunk, future.result() if future else None)
+                           for key, games_in_chunk, future in chunks]
+            except Exception as error:
+                """ The file couldn't be parsed, or a worker process died. Its chunks
+                are kept as they were and the file is scanned again on the next poll,
+                while the other files carry on."""
+                is_pool_broken = is_pool_broken or isinstance(error, BrokenProcessPool)
+                is_scanned = False
+                pgn_file.last_size = 0
+                continue
+
+            games_in_scan = 0
+            scanned_chunks = {}
+
+            for key, games_in_chunk, parsed_games in results:
+                if parsed_games is not None:
+                    for parsed_game in parsed_games:
+                        players, entries = self.check_game(parsed_game, scan_now, skip_finished)
+                        updated_players.append(players)
+                        new_entries.extend(entries)
+                    games_in_chunk = len(parsed_games)
+
+                scanned_chunks[key] = games_in_chunk
+                games_in_scan += games_in_chunk
+
+            pgn_file.scanned_chunks = scanned_chunks
+            self.games_count_signal.emit(pgn_file.filename, games_in_scan)
+
+        """ Signals are emitted once per scan, not per game, to keep the
+        cross-thread traffic to the GUI low."""
+        if new_entries:
+            self.add_entry_signal.emit(new_entries)
+        if updated_players:
+            self.game_update_signal.emit(updated_players)
+
+        if is_pool_broken:
+            self.start_executor()
+        return is_scanned
+
+    def check_game(self, parsed_game: ParsedGame, scan_now: float, skip_finished: bool) -> Tuple[str, set]:
+        """ Updates the game tracker with a parsed game and records its claims.
+        Args:
+            skip_finished: Whether the claims of finished games are skipped (live_pgn_option).
+        Returns:
+            The players of the game and its new claim entries.
+        """
+        # Interned again, as the identity is lost on the way from the worker process
+        players = sys.intern(parsed_game.players)
+        result = parsed_game.result
+
+        # Update game tracker for ALL games (thread-safe)
+        self.game_tracker.update_game(
+            result, players, parsed_game.board, parsed_game.move_count, parsed_game.last_move,
+            parsed_game.has_error, parsed_game.error_at_move, scan_now
+        )
+
+        # Skip claim checking only if live_pgn is checked AND game is finished
+        if skip_finished and result != "*":
+            return players, set()
+
+        if self.claims.is_in_dont_check(players):
+            return players, set()
+
+        if parsed_game.has_error:
+            return players, set()  # Skip claim checking for games with errors
+
+        entries = self.claims.add_entries(parsed_game.entries)
+        for entry in entries:
+            # Also track claims in the game tracker
+            self.game_tracker.add_claim_to_game(players, CLAIM_VALUE[entry[0]])
+        return players, entries
 
 
 class Stop(QThread):
-    """ Stops all the other running Threads(downloadWorker, scan_workers)
+    """ Stops all the other running Threads(downloadWorker, scanWorker)
     and resets the model for the next scan.
 
     Attributes:
         stop_event: The stop event that can signal the termination of threads
         download_worker: Running thread, object of Download Class.
-        scan_workers: List of running scan threads (one per file).
-        make_pgn_worker: [DEPRECATED] Running thread, object of makePgn Class.
+        scan_worker: Running thread, object of ScanFiles Class.
     """
     enable_signal = pyqtSignal()
     disable_signal = pyqtSignal()
 
-    __slots__ = ["stop_event", "make_pgn_worker", "scan_workers", "download_worker"]
+    __slots__ = ["stop_event", "scan_worker", "download_worker"]
 
-    def __init__(self, stop_event: Event, scan_workers: List[QThread],
-                 download_worker: QThread = None, make_pgn_worker: Thread = None):
+    def __init__(self, stop_event: Event, scan_worker: QThread, download_worker: QThread = None):
         super().__init__()
         self.stop_event = stop_event
         self.download_worker = download_worker
-        self.scan_workers = scan_workers if isinstance(scan_workers, list) else [scan_workers]
-        self.make_pgn_worker = make_pgn_worker
+        self.scan_worker = scan_worker
 
     def run(self):
         self.disable_signal.emit()
@@ -370,68 +424,7 @@ class Stop(QThread):
 
         if self.download_worker:
             self.download_worker.wait()
-        
-        # Wait for all scan workers to finish
-        for scan_worker in self.scan_workers:
-            if scan_worker:
-                scan_worker.wait()
-        
-        # Legacy support for MakePgn if still used
-        if self.make_pgn_worker:
-            self.make_pgn_worker.join()
+        self.scan_worker.wait()
 
         self.enable_signal.emit()
 
-
-class MakePgn(Thread):
-    """ Makes a combined pgn of all the sources available (using the filePathList).
-    The thread execution can be stopped by "setting" the event (`stop_event.set()`).
-    If the event is not provided the thread will only execute once.
-
-    Attributes:
-        filepaths: A list that contains all the files path(or url) which are valid.
-        stop_event: The event that is responsible for the execution of the thread.
-        lock: The fileLock for the games.pgn between CheckPgn and MakePgn threads.
-    """
-    INTERVAL = 4
-    __slots__ = ["filepaths", "stop_event", "is_running", "lock", "daemon"]
-
-    def __init__(self, filepaths: List[str], stop_event: Event = None, lock: Lock = None):
-        super().__init__()
-        self.filepaths = filepaths
-        self.lock = lock
-        self.stop_event = stop_event
-        self.daemon = True
-
-        app_path = get_appdata_path()
-        self.filename = os.path.join(app_path, "games.pgn")
-
-    def run(self) -> None:
-        if not self.stop_event:
-            return self.make_pgn()
-
-        while not self.stop_event.is_set():
-            self.make_pgn()
-            self.stop_event.wait(self.INTERVAL)
-
-    def make_pgn(self):
-        data = bytes()
-        for filepath in self.filepaths:
-            try:
-                with open(filepath, "rb") as in_file:
-                    data += "\n\n".encode("utf-8") + in_file.read()
-            except FileNotFoundError:
-                continue
-
-        self.lock_file()
-        with open(self.filename, "wb") as file:
-            file.write(data)
-        self.release_file()
-
-    def lock_file(self):
-        if self.lock:
-            self.lock.acquire()
-
-    def release_file(self):
-        if self.lock:
-            self.lock.release()
@@ -381,8 +381,10 @@ class ChessClaimView(QMainWindow):
             players_item = self.games_table_model.item(index, 1)
             if players_item:
                 players = players_item.text()
-                if hasattr(self.controller, 'game_tracker') and players in self.controller.game_tracker.games:
-                    game = self.controller.game_tracker.games[players]
+                game = None
+                if hasattr(self.controller, 'game_tracker'):
+                    game = self.controller.game_tracker.get_game(players)
+                if game:
                     time_item = QStandardItem(game.time_since_update())
                     time_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
                     self.games_table_model.setItem(index, 4, time_item)